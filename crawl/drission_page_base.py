@@ -1,13 +1,154 @@
+import asyncio
+import queue
 import random
+import re
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Union
 
 from DrissionPage import WebPage, ChromiumOptions
 from DrissionPage._elements.chromium_element import ChromiumElement
+from DrissionPage._pages.chromium_frame import ChromiumFrame
 from DrissionPage._pages.chromium_tab import ChromiumTab
-from random_user_agent.params import SoftwareName, OperatingSystem
-from random_user_agent.user_agent import UserAgent
+
+try:
+    from DrissionPage.errors import IncorrectURLError
+except ImportError:  # DrissionPage < 4.1.1 named it WrongURLError
+    from DrissionPage.errors import WrongURLError as IncorrectURLError
+
+_BROWSER_PATHS = {
+    'chrome': '/usr/bin/google-chrome',
+    'brave': '/usr/bin/brave-browser',
+    'opera': '/usr/bin/opera',
+    'edge': '/usr/bin/microsoft-edge-dev',
+}
+
+_MOBILE_EMULATION = {
+    "width": 411,  # Viewport width
+    "height": 731,  # Viewport height
+    "deviceScaleFactor": 2.625,  # Pixel ratio
+    "mobile": True,  # Enable mobile events (touch, etc.)
+    "screenOrientation": {"angle": 0, "type": "portraitPrimary"}  # Optional: Orientation
+}
+
+_MOBILE_UA = {
+    "userAgent": "Mozilla/5.0 (Linux; Android 8.0.0; Pixel Build/OPR3.170623.007) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/67.0.3396.68 Mobile Safari/537.36",
+    "platform": "Android"  # Optional
+}
+
+# Standard headless-scrape flags that cut background networking, timers and CPU wakeups
+_PERF_ARGUMENTS = [
+    '--disable-background-networking',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-breakpad',
+    '--disable-client-side-phishing-detection',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-domain-reliability',
+    '--disable-hang-monitor',
+    '--disable-ipc-flooding-protection',
+    '--disable-popup-blocking',
+    '--disable-prompt-on-repost',
+    '--disable-renderer-backgrounding',
+    '--disable-sync',
+    '--metrics-recording-only',
+    '--no-first-run',
+    '--mute-audio',
+]
+_PERF_DISABLED_FEATURES = 'TranslateUI,BlinkGenPropertyTrees,IsolateOrigins,site-per-process'
+
+# Error fragments that mean retrying the same URL can never succeed
+_UNRECOVERABLE_MARKERS = ('ERR_NAME_NOT_RESOLVED', 'NXDOMAIN', 'ERR_INVALID_URL')
+# Default truncated exponential backoff between page load attempts
+_BACKOFF_BASE_DELAY = 1.0
+_BACKOFF_MAX_DELAY = 30
+_BACKOFF_JITTER = 0.5
+
+# DrissionPage reports HTTP failures as ConnectionError('Status Code: N'), in English or Chinese
+_STATUS_CODE_PATTERN = re.compile(r'(?:Status Code|状态码): (\d{3})')
+
+# Scrolls the element (bound to `this`) into view and returns its center in viewport coordinates.
+# The scroll is forced instant so a smooth scroll-behavior cannot leave the rect stale.
+_SCROLL_TO_CENTER_JS = """
+this.scrollIntoView({behavior: 'instant', block: 'center', inline: 'center'});
+const rect = this.getBoundingClientRect();
+return {x: rect.x + rect.width / 2, y: rect.y + rect.height / 2};
+"""
+
+# Returns the viewport size and the center of each element passed as an argument, without scrolling
+_ELEMENT_CENTERS_JS = """
+return {
+    width: window.innerWidth,
+    height: window.innerHeight,
+    centers: Array.from(arguments).map(function (el) {
+        const rect = el.getBoundingClientRect();
+        return {x: rect.x + rect.width / 2, y: rect.y + rect.height / 2};
+    })
+};
+"""
+
+# Offset of the iframe's content box (bound to `this`) inside its parent's viewport
+_FRAME_CONTENT_OFFSET_JS = """
+const rect = this.getBoundingClientRect();
+return {x: rect.x + this.clientLeft, y: rect.y + this.clientTop};
+"""
+
+
+class RecoverableError(Exception):
+    pass
+
+
+class UnrecoverableError(Exception):
+    pass
+
+
+def _classify_error(error: Exception) -> Exception:
+    # Anything not known to be permanent is retried, including browser disconnects and lost contexts
+    message = f"{type(error).__name__}: {error}"
+    match = _STATUS_CODE_PATTERN.search(str(error)) if isinstance(error, ConnectionError) else None
+    if match:
+        # Retry throttling and server-side failures, any other 4xx will not change on retry
+        status_code = int(match.group(1))
+        if status_code == 429 or status_code >= 500:
+            return RecoverableError(message)
+        return UnrecoverableError(message)
+    # ValueError covers invalid URLs raised by requests in session mode
+    if isinstance(error, (IncorrectURLError, ValueError)) or any(marker in message for marker in _UNRECOVERABLE_MARKERS):
+        return UnrecoverableError(message)
+    return RecoverableError(message)
+
+
+def _get_with_backoff(page, url, retry: int, timeout: int, base_delay: float, max_delay: float, jitter: float):
+    # Truncated exponential backoff with jitter between attempts, fail fast on unrecoverable errors
+    for attempt in range(retry + 1):
+        try:
+            return page.get(url, show_errmsg=True, retry=0, timeout=timeout)
+        except Exception as e:
+            error = _classify_error(e)
+            if isinstance(error, UnrecoverableError) or attempt == retry:
+                raise error from e
+
+        delay = min(max_delay, base_delay * (2 ** attempt)) * (1 + random.uniform(-jitter, jitter))
+        time.sleep(delay)
+
+
+def _is_debug_port_live(debug_port: int) -> bool:
+    try:
+        with socket.create_connection(('127.0.0.1', debug_port), timeout=0.2):
+            return True
+    except OSError:
+        return False
 
 
 class DrissionPageBase(object):
+    _UA_ROTATOR = None
+
     def __init__(
         self,
         window_size: str = "full",
@@ -17,9 +158,43 @@ class DrissionPageBase(object):
         time_implicitly_wait: int = 10,
         driver_name: str = "chrome",
         debug_port: int = 9222,
+        perf_flags: bool = True,
+        reuse_existing_browser: bool = False,
+        user_data_dir: Optional[str] = None,
     ):
         co = ChromiumOptions()
 
+        if debug_port != -1:
+            co.set_address(f'127.0.0.1:{debug_port}')
+
+        browser_path = _BROWSER_PATHS.get(driver_name)
+        if browser_path is None:
+            raise ValueError(f"Unsupported driver name: {driver_name}")
+
+        # Launch-only arguments are ignored when attaching to a live browser, so skip building them
+        attach = reuse_existing_browser and debug_port != -1 and _is_debug_port_live(debug_port)
+        if not attach:
+            self._set_launch_arguments(co, window_size, is_headless, is_incognito, is_user_agent,
+                                       browser_path, perf_flags, user_data_dir)
+
+        self.page = WebPage(chromium_options=co, timeout=time_implicitly_wait)
+        self._new_tab_lock = threading.Lock()
+
+        if attach and is_user_agent:
+            # A running browser ignores the launch argument, so override the user agent on the page
+            self.page.set.user_agent(self._config_user_agent())
+
+    def _set_launch_arguments(
+        self,
+        co: ChromiumOptions,
+        window_size: str,
+        is_headless: bool,
+        is_incognito: bool,
+        is_user_agent: bool,
+        browser_path: str,
+        perf_flags: bool,
+        user_data_dir: Optional[str],
+    ):
         if is_headless:
             co.set_argument('--headless')
             co.set_argument('--no-sandbox')
@@ -34,38 +209,57 @@ class DrissionPageBase(object):
         co.set_argument('--disable-dev-shm-usage')
         co.set_argument('--disable-gpu')
 
+        if perf_flags:
+            for argument in _PERF_ARGUMENTS:
+                co.set_argument(argument)
+            # set_argument replaces the switch, so keep features already disabled (e.g. DrissionPage's defaults)
+            disabled_features = [arg.split('=', 1)[1] for arg in co.arguments if arg.startswith('--disable-features=')]
+            co.set_argument('--disable-features', value=','.join(disabled_features + [_PERF_DISABLED_FEATURES]))
+
         if window_size == 'full':
             co.set_argument('--start-maximized')
         else:
             co.set_argument('--window-size', value=window_size)
 
-        if debug_port != -1:
-            co.set_address(f'127.0.0.1:{debug_port}')
+        co.set_browser_path(browser_path)
 
-        if driver_name == 'chrome':
-            co.set_browser_path('usr/bin/google-chrome')
-        elif driver_name == 'brave':
-            co.set_browser_path('usr/bin/brave-browser')
-        elif driver_name == 'opera':
-            co.set_browser_path('usr/bin/opera')
-        elif driver_name == 'edge':
-            co.set_browser_path('usr/bin/microsoft-edge-dev')
-        else:
-            raise Exception(f"Unsupported driver name: {driver_name}")
+        if user_data_dir is not None:
+            co.set_user_data_path(user_data_dir)
 
-        self.page = WebPage(chromium_options=co, timeout=time_implicitly_wait)
+    @classmethod
+    def pool(cls, size: int = 4, debug_port: int = 9222, **kwargs) -> 'Pool':
+        return Pool(cls, size=size, debug_port=debug_port, **kwargs)
 
     @staticmethod
     def _config_user_agent():
-        software_names = [SoftwareName.CHROME.value]
-        operating_systems = [OperatingSystem.WINDOWS.value, OperatingSystem.LINUX.value, OperatingSystem.MAC.value]
-        user_agent_rotator = UserAgent(software_names=software_names,
-                                       operating_systems=operating_systems, limit=100)
-        user_agent = user_agent_rotator.get_random_user_agent()
-        return user_agent
+        # Build the rotator once per process, loading the user-agent corpus is expensive. It is stored on
+        # DrissionPageBase itself, assigning through cls would give each subclass its own copy.
+        if DrissionPageBase._UA_ROTATOR is None:
+            # Imported lazily so the corpus is only loaded when a random user agent is requested
+            from random_user_agent.params import SoftwareName, OperatingSystem
+            from random_user_agent.user_agent import UserAgent
 
-    def open_url(self, url, retry: int = 3, interval: int = 3, timeout: int = 30):
-        self.page.get(url, retry=retry, interval=interval, timeout=timeout)
+            software_names = [SoftwareName.CHROME.value]
+            operating_systems = [OperatingSystem.WINDOWS.value, OperatingSystem.LINUX.value, OperatingSystem.MAC.value]
+            DrissionPageBase._UA_ROTATOR = UserAgent(software_names=software_names,
+                                                     operating_systems=operating_systems, limit=100)
+        return DrissionPageBase._UA_ROTATOR.get_random_user_agent()
+
+    def open_url(
+        self,
+        url,
+        retry: int = 3,
+        interval: Optional[float] = None,
+        timeout: int = 30,
+        base_delay: float = _BACKOFF_BASE_DELAY,
+        max_delay: float = _BACKOFF_MAX_DELAY,
+        jitter: float = _BACKOFF_JITTER,
+    ):
+        if interval is not None:
+            warnings.warn("open_url(interval=...) is deprecated, use base_delay instead",
+                          DeprecationWarning, stacklevel=2)
+            base_delay = interval
+        return _get_with_backoff(self.page, url, retry, timeout, base_delay, max_delay, jitter)
 
     def quit(self):
         self.page.quit()
@@ -79,19 +273,69 @@ class DrissionPageBase(object):
     def sleep_for_seconds(self, seconds: float = 30):
         self.page.wait(seconds)
 
-    def open_new_tab(self, url, quiet: bool = False):
-        tab = self.page.new_tab(url, background=quiet)
-        self.page.wait.new_tab()
+    async def asleep_for_seconds(self, seconds: float = 30):
+        # Non-blocking variant for async orchestration, lets other tabs' work overlap the wait
+        await asyncio.sleep(seconds)
+
+    def open_new_tab(self, url, quiet: bool = False, timeout: float = 30):
+        # In incognito new_tab falls back to window.open and picks the newest tab, so concurrent
+        # callers could get the same tab; only creation is serialized, loading still runs in parallel
+        with self._new_tab_lock:
+            tab = self.page.new_tab(url, background=quiet)
+
+        # new_tab already returns the tab, only wait for the document when something is being loaded
+        if url:
+            tab.wait.doc_loaded(timeout=timeout)
         return tab
 
+    async def scrape_many(
+        self,
+        urls: Iterable[str],
+        concurrency: int = 8,
+        handler: Optional[Callable[[ChromiumTab], Any]] = None,
+        retry: int = 3,
+        timeout: int = 30,
+        base_delay: float = _BACKOFF_BASE_DELAY,
+        max_delay: float = _BACKOFF_MAX_DELAY,
+        jitter: float = _BACKOFF_JITTER,
+    ) -> List[Any]:
+        # Scrape urls concurrently across tabs of this single browser. Instantiate DrissionPageBase once
+        # and call this instead of constructing one instance per URL. `handler` receives each loaded tab
+        # (default returns its html); results keep the order of `urls`, a failed URL yields its exception.
+        if handler is None:
+            handler = lambda tab: tab.html  # noqa: E731
+
+        semaphore = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+
+        def scrape(url):
+            # DrissionPage is synchronous, so each tab's whole lifecycle runs in a worker thread
+            tab = self.open_new_tab(None, quiet=True)
+            try:
+                _get_with_backoff(tab, url, retry, timeout, base_delay, max_delay, jitter)
+                return handler(tab)
+            finally:
+                tab.close()
+
+        async def run(url, executor):
+            async with semaphore:
+                return await loop.run_in_executor(executor, scrape, url)
+
+        # Not a `with` block: on cancellation shutdown(wait=True) would block the event loop on open tabs
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        try:
+            return await asyncio.gather(*(run(url, executor) for url in urls), return_exceptions=True)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def slow_scroll(self):
+        # smooth() styles the current document, so it has to be reapplied after every navigation.
+        # It also turns on wait_complete, so each scroll.down() returns once the scroll has settled.
         self.page.set.scroll.smooth(True)
-        self.page.set.scroll.wait_complete(True)
-        delay_amount = random.uniform(0.5, 2)
+
         scroll_amount = random.randint(500, 1000)
         for _ in range(5):
             self.page.scroll.down(scroll_amount)
-            self.page.wait(delay_amount)
 
     def go_back(self):
         self.page.back()
@@ -102,38 +346,78 @@ class DrissionPageBase(object):
     def set_mode(self, mode: str, go: bool = True):
         self.page.change_mode(mode, go=go)
 
-    def enable_mobile_mode(self):
-        mobile_emulation = {
-            "width": 411,  # Viewport width
-            "height": 731,  # Viewport height
-            "deviceScaleFactor": 2.625,  # Pixel ratio
-            "mobile": True,  # Enable mobile events (touch, etc.)
-            "screenOrientation": {"angle": 0, "type": "portraitPrimary"}  # Optional: Orientation
-        }
+    def enable_mobile_mode(self, emulation: Optional[dict] = None, user_agent: Optional[dict] = None):
+        # Overrides are merged on top of the defaults, which are used as-is when not given
+        mobile_emulation = {**_MOBILE_EMULATION, **emulation} if emulation else _MOBILE_EMULATION
         self.page.run_cdp("Emulation.setDeviceMetricsOverride", **mobile_emulation)
 
         # Set mobile user agent
-        ua = {
-            "userAgent": "Mozilla/5.0 (Linux; Android 8.0.0; Pixel Build/OPR3.170623.007) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/67.0.3396.68 Mobile Safari/537.36",
-            "platform": "Android"  # Optional
-        }
+        ua = {**_MOBILE_UA, **user_agent} if user_agent else _MOBILE_UA
         self.page.run_cdp("Emulation.setUserAgentOverride", **ua)
-        
-    def touch_tap(self, tab: ChromiumTab, element: ChromiumElement) -> None:
-        # Ensure element is in view (optional but recommended for mobile scrolling)
-        element.scroll.to_see()
 
-        # Get element's viewport rectangle
-        bounding_rect = element.run_js('return this.getBoundingClientRect();')
+    def touch_tap(self, tab: ChromiumTab, element: ChromiumElement) -> dict:
+        # Scroll and measure in one call, then send a trusted touch pair so the page also gets the
+        # compatibility mouse events, the click and default actions (links, focus, form submit)
+        center = element.run_js(_SCROLL_TO_CENTER_JS)
+        offset = self._frame_offset(element.owner)
+        point = {'x': center['x'] + offset['x'], 'y': center['y'] + offset['y']}
+        self._dispatch_touch_tap(tab, point)
+        return point
+
+    def touch_tap_many(self, tab: ChromiumTab, elements: Union[str, Iterable[ChromiumElement]]) -> List[dict]:
+        # Read the centers of all elements sharing a document in one call, then send the trusted touch
+        # pairs back-to-back. Elements outside the viewport fall back to touch_tap, which scrolls first.
+        if isinstance(elements, str):
+            elements = tab.eles(f'css:{elements}')
+        elements = list(elements)
+
+        # Elements in an iframe have to be evaluated in that frame's own execution context
+        groups = {}
+        for index, element in enumerate(elements):
+            groups.setdefault(id(element.owner), (element.owner, []))[1].append(index)
+
+        points = [None] * len(elements)
+        tab_viewport = None
+        for owner, indexes in groups.values():
+            result = owner.run_js(_ELEMENT_CENTERS_JS, *(elements[i] for i in indexes))
+            offset = self._frame_offset(owner)
+            if (offset['x'] or offset['y']) and tab_viewport is None:
+                tab_viewport = tab.run_js('return {width: window.innerWidth, height: window.innerHeight};')
+            for index, center in zip(indexes, result['centers']):
+                point = {'x': center['x'] + offset['x'], 'y': center['y'] + offset['y']}
+                visible = 0 <= center['x'] < result['width'] and 0 <= center['y'] < result['height']
+                if visible and tab_viewport is not None:
+                    visible = 0 <= point['x'] < tab_viewport['width'] and 0 <= point['y'] < tab_viewport['height']
+                if visible:
+                    points[index] = point
 
-        # Calculate center coordinates
-        center_x = bounding_rect['x'] + (bounding_rect['width'] / 2)
-        center_y = bounding_rect['y'] + (bounding_rect['height'] / 2)
+        # Once a fallback has scrolled the page the precomputed points are stale, so re-measure from there
+        scrolled = False
+        for index, element in enumerate(elements):
+            if scrolled or points[index] is None:
+                points[index] = self.touch_tap(tab, element)
+                scrolled = True
+            else:
+                self._dispatch_touch_tap(tab, points[index])
+        return points
 
+    def _frame_offset(self, owner) -> dict:
+        # Sum the content offsets of every iframe between the element's document and the tab
+        x = y = 0
+        while isinstance(owner, ChromiumFrame):
+            frame_ele = owner.frame_ele
+            offset = frame_ele.run_js(_FRAME_CONTENT_OFFSET_JS)
+            x += offset['x']
+            y += offset['y']
+            owner = frame_ele.owner
+        return {'x': x, 'y': y}
+
+    @staticmethod
+    def _dispatch_touch_tap(tab: ChromiumTab, point: dict):
         # Define touch point for a basic tap
         touch_point = {
-            'x': center_x,
-            'y': center_y,
+            'x': point['x'],
+            'y': point['y'],
             'id': 0,  # Unique touch identifier
             'radiusX': 1,  # Simulated finger radius
             'radiusY': 1,
@@ -143,7 +427,95 @@ class DrissionPageBase(object):
         # Simulate finger down (touchStart)
         tab.run_cdp('Input.dispatchTouchEvent', type='touchStart', touchPoints=[touch_point])
 
-        self.sleep_for_seconds(0.1)
+        # run_cdp already waits for the command ack, so only keep a short human-like press gap
+        time.sleep(random.uniform(0.02, 0.05))
 
-        # Simulate finger up (touchEnd) - instant tap, add time.sleep(0.1) if a press is needed
+        # Simulate finger up (touchEnd)
         tab.run_cdp('Input.dispatchTouchEvent', type='touchEnd', touchPoints=[touch_point])
+
+
+class Pool(object):
+    # Keeps `size` pre-warmed browsers, each on its own debug port and profile directory, so batched
+    # scrapers pay browser startup and teardown once per pool instead of once per URL.
+    #     with DrissionPageBase.pool(size=4) as pool:
+    #         pages = pool.run(urls)
+
+    def __init__(
+        self,
+        factory: Callable[..., DrissionPageBase] = DrissionPageBase,
+        size: int = 4,
+        debug_port: int = 9222,
+        **kwargs,
+    ):
+        self.size = size
+        self._instances = []
+        self._user_data_dirs = []
+        self._queue = queue.Queue()
+        try:
+            for i in range(size):
+                # Never attach to a browser the pool did not start, close() would quit it
+                port = debug_port + i
+                if _is_debug_port_live(port):
+                    raise RuntimeError(f"Debug port {port} is already in use")
+                user_data_dir = tempfile.mkdtemp(prefix='drission_pool_')
+                self._user_data_dirs.append(user_data_dir)
+                instance = factory(debug_port=port, user_data_dir=user_data_dir,
+                                   **{**kwargs, 'reuse_existing_browser': False})
+                self._instances.append(instance)
+                self._queue.put(instance)
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def acquire(self, timeout: Optional[float] = None) -> DrissionPageBase:
+        return self._queue.get(timeout=timeout)
+
+    def release(self, instance: DrissionPageBase):
+        self._queue.put(instance)
+
+    def run(
+        self,
+        urls: Iterable[str],
+        handler: Optional[Callable[[WebPage], Any]] = None,
+        retry: int = 3,
+        timeout: int = 30,
+    ) -> List[Any]:
+        # Results keep the order of `urls`; a URL that failed yields its exception instead of a result
+        if handler is None:
+            handler = lambda page: page.html  # noqa: E731
+
+        def scrape(url):
+            instance = self.acquire()
+            try:
+                instance.open_url(url, retry=retry, timeout=timeout)
+                return handler(instance.page)
+            except Exception as e:
+                return e
+            finally:
+                self.release(instance)
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(scrape, urls))
+
+    def close(self):
+        # Drain the queue first so acquire() can never hand out a browser that has quit
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        for instance in self._instances:
+            try:
+                instance.quit()
+            except Exception:
+                pass
+        self._instances = []
+        for user_data_dir in self._user_data_dirs:
+            shutil.rmtree(user_data_dir, ignore_errors=True)
+        self._user_data_dirs = []